@@ -0,0 +1,27 @@
+"""
+Ahead-of-time compile the numeric kernels in kernels.py into the vg_kernels extension module.
+
+Run this once after installing the dependencies:
+
+    python build_kernels.py
+
+utils imports vg_kernels when it is present and otherwise falls back to compiling
+the same kernels with numba at import time.
+"""
+
+import os
+
+from numba.pycc import CC
+
+import kernels
+
+def build():
+    """Compile vg_kernels next to this script."""
+    cc = CC('vg_kernels')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('rolling_volatility_f64', 'f8[:](f8[:], i8)')(kernels.rolling_volatility)
+    cc.export('max_drawdown_f64', 'f8(f8[:])')(kernels.max_drawdown)
+    cc.compile()
+
+if __name__ == "__main__":
+    build()
\ No newline at end of file
@@ -2,58 +2,78 @@
 This module defines the ChallengeManager class and various market challenges.
 """
 
-import random
-from typing import Callable, List, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 class Challenge:
     """Represents a market challenge with a name, description, and effect."""
 
-    def __init__(self, name: str, description: str, effect: Callable[[float, float], Tuple[float, float]]):
+    def __init__(self, name: str, description: str, price_factor: float, volatility_factor: float,
+                 stochastic: bool = False):
         """
         Initialize a Challenge.
 
         Args:
             name (str): The name of the challenge.
             description (str): A brief description of the challenge.
-            effect (Callable): A function that takes current price and volatility and returns new values.
+            price_factor (float): Factor the challenge multiplies the price by.
+            volatility_factor (float): Factor the challenge multiplies the volatility by.
+            stochastic (bool): Whether both factors are further scaled by the day's
+                pre-drawn economic news factors.
         """
         self.name = name
         self.description = description
-        self.effect = effect
+        self.price_factor = price_factor
+        self.volatility_factor = volatility_factor
+        self.stochastic = stochastic
 
 class ChallengeManager:
     """Manages and applies market challenges."""
 
-    def __init__(self):
-        """Initialize the ChallengeManager with a set of predefined challenges."""
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        """
+        Initialize the ChallengeManager with a set of predefined challenges.
+
+        Args:
+            rng (Optional[np.random.Generator]): Generator used by get_random_challenge.
+                Defaults to a freshly seeded np.random.default_rng().
+        """
+        self._rng = np.random.default_rng() if rng is None else rng
         self.challenges: List[Challenge] = [
             Challenge(
                 "Volatility Spike",
                 "Market volatility suddenly increases.",
-                lambda p, v: (p, v * 2)
+                1.0, 2.0
             ),
             Challenge(
                 "Market Crash",
                 "A sudden downturn causes prices to plummet.",
-                lambda p, v: (p * 0.8, v * 1.5)
+                0.8, 1.5
             ),
             Challenge(
                 "Bull Run",
                 "A surge of optimism drives prices up.",
-                lambda p, v: (p * 1.2, v * 1.2)
+                1.2, 1.2
             ),
             Challenge(
                 "Calm Markets",
                 "Volatility decreases as markets enter a calm period.",
-                lambda p, v: (p, v * 0.5)
+                1.0, 0.5
             ),
             Challenge(
                 "Economic News",
                 "Breaking economic news causes price fluctuation.",
-                lambda p, v: (p * random.uniform(0.9, 1.1), v * random.uniform(0.8, 1.2))
+                1.0, 1.0, stochastic=True
             )
         ]
 
+        # Dispatch tables indexed by challenge index
+        self.names = [challenge.name for challenge in self.challenges]
+        self.price_factors = np.array([challenge.price_factor for challenge in self.challenges])
+        self.vol_factors = np.array([challenge.volatility_factor for challenge in self.challenges])
+        self.stochastic = np.array([challenge.stochastic for challenge in self.challenges])
+
     def get_random_challenge(self) -> Challenge:
         """
         Select a random challenge from the available challenges.
@@ -61,19 +81,44 @@ class ChallengeManager:
         Returns:
             Challenge: A randomly selected challenge.
         """
-        return random.choice(self.challenges)
+        return self.challenges[self._rng.integers(len(self.challenges))]
 
-    def apply_challenge(self, price: float, volatility: float) -> Tuple[float, float, Challenge]:
+    def apply_challenge(self, price: float, volatility: float, index: int,
+                        econ_p: float, econ_v: float) -> Tuple[float, float, Challenge]:
         """
-        Apply a random challenge to the given market state.
+        Apply the challenge at the given index to the given market state.
 
         Args:
             price (float): The current market price.
             volatility (float): The current market volatility.
+            index (int): The index of the challenge to apply.
+            econ_p (float): Pre-drawn price factor used by stochastic challenges.
+            econ_v (float): Pre-drawn volatility factor used by stochastic challenges.
 
         Returns:
             Tuple[float, float, Challenge]: The new price, new volatility, and the applied challenge.
         """
-        challenge = self.get_random_challenge()
-        new_price, new_volatility = challenge.effect(price, volatility)
-        return new_price, new_volatility, challenge
\ No newline at end of file
+        challenge = self.challenges[index]
+        price_factor = challenge.price_factor * (econ_p if challenge.stochastic else 1.0)
+        volatility_factor = challenge.volatility_factor * (econ_v if challenge.stochastic else 1.0)
+        return price * price_factor, volatility * volatility_factor, challenge
+
+    def challenge_factors(self, indices: np.ndarray, econ_p: np.ndarray,
+                          econ_v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the price and volatility factors for a whole schedule of challenges.
+
+        Args:
+            indices (np.ndarray): The challenge index for each day.
+            econ_p (np.ndarray): Pre-drawn price factors for each day.
+            econ_v (np.ndarray): Pre-drawn volatility factors for each day.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The price and volatility factors for each day.
+        """
+        price_factors = self.price_factors[indices]
+        vol_factors = self.vol_factors[indices]
+        mask = self.stochastic[indices]
+        price_factors[mask] *= econ_p[mask]
+        vol_factors[mask] *= econ_v[mask]
+        return price_factors, vol_factors
\ No newline at end of file
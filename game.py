@@ -3,99 +3,248 @@ This module defines the Game class, which orchestrates the market making simulat
 """
 
 import logging
-import random
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
 from dataclasses import dataclass
 
-from market import Market
+import numpy as np
+
+from market import Market, MIN_PRICE, MIN_VOLATILITY
 from challenges import ChallengeManager
 from market_maker import MarketMaker
 
-@dataclass
+# Widen the trading range slightly: a 0.1% buffer on each side of the quotes
+BID_MULT = 1.001
+ASK_MULT = 0.999
+
+@dataclass(slots=True, frozen=True)
 class TradeResult:
     """Represents the result of a single trade."""
     trade_type: str
     price: float
     quantity: int
 
+def _clamped_cumprod(start: float, factors: np.ndarray, floor: float) -> np.ndarray:
+    """Running product of start and factors, floored after every step."""
+    path = np.cumprod(np.concatenate(([start], factors)))[1:]
+    below = path < floor
+    if below.any():
+        # Re-walk sequentially from the first day the floor fires
+        first = int(np.argmax(below))
+        value = path[first - 1] if first else start
+        for i in range(first, len(factors)):
+            value = max(floor, value * factors[i])
+            path[i] = value
+    return path
+
+def _trade_masks(prices: np.ndarray, bids: np.ndarray, asks: np.ndarray, rand_trade: np.ndarray,
+                 rand_side: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decide which trades execute on each day.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Boolean masks over days for
+            quoted buys, quoted sells, random buys and random sells.
+    """
+    # At most one trade against the quotes per day, the bid taking priority
+    buys = prices <= bids * BID_MULT
+    sells = ~buys & (prices >= asks * ASK_MULT)
+
+    # Add a small chance of random trading
+    random_trades = rand_trade < 0.1  # 10% chance of random trade
+    random_buys = random_trades & (rand_side == 0)
+    random_sells = random_trades & (rand_side != 0)
+    return buys, sells, random_buys, random_sells
+
+def _run_days_vec(p0: float, v0: float, returns: np.ndarray, price_factors: np.ndarray,
+                  vol_factors: np.ndarray, rand_trade: np.ndarray, rand_side: np.ndarray,
+                  make_market_batch: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate every day of the game in a handful of array passes.
+
+    Args:
+        p0 (float): The market price before the first day.
+        v0 (float): The market volatility before the first day.
+        returns (np.ndarray): The precomputed daily returns, drawn at volatility v0.
+        price_factors (np.ndarray): The challenge price factor for each day.
+        vol_factors (np.ndarray): The challenge volatility factor for each day.
+        rand_trade (np.ndarray): The random-trade roll for each day.
+        rand_side (np.ndarray): The random-trade side for each day (0 is a buy).
+        make_market_batch (Callable): Produces the (bid, ask) arrays from the price and volatility paths.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            The price, volatility, bid, ask and P&L for each day.
+    """
+    days = len(returns)
+    vols = _clamped_cumprod(v0, vol_factors, MIN_VOLATILITY)
+
+    # Rescale each return to the volatility in force at the start of its day
+    prev_vols = np.concatenate(([v0], vols[:-1]))
+    market_factors = Market.price_factors(returns * (prev_vols / v0))
+
+    # Interleave the market move and the challenge so the price floor applies after each
+    steps = np.empty(2 * days)
+    steps[0::2] = market_factors
+    steps[1::2] = price_factors
+    prices = _clamped_cumprod(p0, steps, MIN_PRICE)[1::2]
+
+    bids, asks = make_market_batch(prices, vols)
+
+    buys, sells, random_buys, random_sells = _trade_masks(prices, bids, asks, rand_trade, rand_side)
+    buy_pnl = prices - bids
+    sell_pnl = asks - prices
+    pnl = np.where(buys, buy_pnl, 0.0) + np.where(sells, sell_pnl, 0.0)
+    pnl += np.where(random_buys, buy_pnl, np.where(random_sells, sell_pnl, 0.0))
+    return prices, vols, bids, asks, pnl
+
 class Game:
-    def __init__(self, market: Market, challenge_manager: ChallengeManager, market_maker: MarketMaker, days: int):
+    def __init__(self, market: Market, challenge_manager: ChallengeManager, market_maker: MarketMaker, days: int,
+                 rng: Optional[np.random.Generator] = None, batch: bool = False):
         self.market = market
         self.challenge_manager = challenge_manager
         self.market_maker = market_maker
+        self._make_market = market_maker.make_market
         self.days = days
+        self.batch = batch
         self.total_pnl = 0.0
-        self.daily_results: List[Tuple[int, float, float, float, str]] = []
+
+        # Daily results, stored as one array per field
+        self.days_arr = np.arange(1, days + 1)
+        self.bid_arr = np.empty(days, dtype=np.float64)
+        self.ask_arr = np.empty(days, dtype=np.float64)
+        self.pnl_arr = np.empty(days, dtype=np.float64)
+        self.challenge_arr = np.empty(days, dtype=object)
+        self.price_arr = np.empty(days, dtype=np.float64)
+        self.vol_arr = np.empty(days, dtype=np.float64)
+
+        # Draw all per-day randomness up front
+        self._rng = np.random.default_rng() if rng is None else rng
+        self._challenge_idx = self._rng.integers(0, len(challenge_manager.challenges), size=days)
+        self._econ_p = self._rng.uniform(0.9, 1.1, size=days)
+        self._econ_v = self._rng.uniform(0.8, 1.2, size=days)
+        self._rand_trade = self._rng.random(size=days)
+        self._rand_side = self._rng.integers(0, 2, size=days)
+        self._challenge_pf, self._challenge_vf = challenge_manager.challenge_factors(
+            self._challenge_idx, self._econ_p, self._econ_v
+        )
 
     def run(self) -> float:
         """Run the game simulation and return the final score."""
         logging.info("Starting game simulation")
 
-        for day in range(1, self.days + 1):
-            daily_pnl = self.simulate_day(day)
-            self.total_pnl += daily_pnl
-            logging.info(f"Day {day} completed. Daily PnL: {daily_pnl:.2f}, Total PnL: {self.total_pnl:.2f}")
+        if self.batch:
+            self.run_batch()
+        else:
+            for day in range(1, self.days + 1):
+                daily_pnl = self.simulate_day(day)
+                self.total_pnl += daily_pnl
+                logging.info("Day %d completed. Daily PnL: %.2f, Total PnL: %.2f", day, daily_pnl, self.total_pnl)
 
-        logging.info(f"Game ended. Total P&L: {self.total_pnl:.2f}")
+        logging.info("Game ended. Total P&L: %.2f", self.total_pnl)
+        for handler in logging.getLogger().handlers:
+            handler.flush()
         return self.calculate_score()
 
-    def simulate_day(self, day: int) -> float:
-        """Simulate a single trading day and return the daily P&L."""
+    def run_batch(self):
+        """Simulate every day at once with the vectorized kernel and record the daily results."""
+        state = self.market.state
+        prices, vols, bids, asks, pnl = _run_days_vec(
+            state.price, state.volatility, self.market.upcoming_returns(self.days),
+            self._challenge_pf, self._challenge_vf, self._rand_trade, self._rand_side,
+            self.market_maker.make_market_batch
+        )
+        self.market.record_path(prices, vols)
+
+        self.price_arr, self.vol_arr = prices, vols
+        self.bid_arr, self.ask_arr, self.pnl_arr = bids, asks, pnl
+        self.challenge_arr[:] = [self.challenge_manager.names[i] for i in self._challenge_idx]
+        self.total_pnl = float(pnl.sum())
+
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            for day, bid, ask, daily_pnl, challenge in zip(self.days_arr, bids, asks, pnl, self.challenge_arr):
+                logging.info("Day %d: Bid=%.2f, Ask=%.2f, P&L=%.2f, Challenge=%s", day, bid, ask, daily_pnl, challenge)
+
+    def advance_market(self, day: int) -> Tuple[float, float]:
+        """Move the market on by one day, apply the day's challenge and return the new price and volatility."""
         # Update market state
+        state = self.market.state
         self.market.update()
 
         # Apply random challenge
-        new_price, new_volatility, challenge = self.challenge_manager.apply_challenge(
-            self.market.get_state().price, 
-            self.market.get_state().volatility
+        self.market.apply_challenge(
+            state.price * float(self._challenge_pf[day - 1]),
+            state.volatility * float(self._challenge_vf[day - 1])
         )
-        self.market.apply_challenge(new_price / self.market.get_state().price, new_volatility / self.market.get_state().volatility)
+        return state.price, state.volatility
+
+    def simulate_day(self, day: int) -> float:
+        """Simulate a single trading day and return the daily P&L."""
+        market_price, volatility = self.advance_market(day)
 
         # Get market maker quotes
-        bid, ask = self.market_maker.make_market(self.market.get_state().price, self.market.get_state().volatility)
+        bid, ask = self._make_market(market_price, volatility)
+        challenge_name = self.challenge_manager.names[self._challenge_idx[day - 1]]
+
+        self.price_arr[day - 1], self.vol_arr[day - 1] = market_price, volatility
 
         # Simulate trades
-        trades = self.simulate_trades(bid, ask)
-        daily_pnl = self.calculate_daily_pnl(trades)
+        trades = self.simulate_trades(day, bid, ask, market_price)
+        daily_pnl = self.calculate_daily_pnl(trades, market_price)
 
         # Log daily results
-        self.log_daily_results(day, bid, ask, daily_pnl, challenge.name)
+        self.log_daily_results(day, bid, ask, daily_pnl, challenge_name)
 
         return daily_pnl
 
 
-    def simulate_trades(self, bid: float, ask: float) -> List[TradeResult]:
+    def simulate_trades(self, day: int, bid: float, ask: float, market_price: float) -> List[TradeResult]:
         """Simulate trades based on market maker quotes."""
         trades = []
-        market_price = self.market.get_state().price
         
-        # Widen the trading range slightly
-        buffer = 0.001  # 0.1% buffer
-        
-        if market_price <= bid * (1 + buffer):
+        if market_price <= bid * BID_MULT:
             trades.append(TradeResult("buy", bid, 1))
-        elif market_price >= ask * (1 - buffer):
+        elif market_price >= ask * ASK_MULT:
             trades.append(TradeResult("sell", ask, 1))
         
         # Add a small chance of random trading
-        if random.random() < 0.1:  # 10% chance of random trade
-            if random.choice([True, False]):
+        if self._rand_trade[day - 1] < 0.1:  # 10% chance of random trade
+            if self._rand_side[day - 1] == 0:
                 trades.append(TradeResult("buy", bid, 1))
             else:
                 trades.append(TradeResult("sell", ask, 1))
         
         # Log trade execution for debugging
         if trades:
-            for trade in trades:
-                logging.info(f"Trade executed: {trade.trade_type} at {trade.price}")
-        else:
-            logging.info(f"No trade executed. Market price: {market_price}, Bid: {bid}, Ask: {ask}")
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                for trade in trades:
+                    logging.debug("Trade executed: %s at %s", trade.trade_type, trade.price)
+        elif logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("No trade executed. Market price: %s, Bid: %s, Ask: %s", market_price, bid, ask)
         return trades
 
-    def calculate_daily_pnl(self, trades: List[TradeResult]) -> float:
+    def trades_for_day(self, day: int) -> List[TradeResult]:
+        """Rebuild the trades executed on a day that has already been simulated."""
+        i = slice(day - 1, day)
+        buys, sells, random_buys, random_sells = (bool(mask[0]) for mask in _trade_masks(
+            self.price_arr[i], self.bid_arr[i], self.ask_arr[i], self._rand_trade[i], self._rand_side[i]
+        ))
+        bid, ask = float(self.bid_arr[day - 1]), float(self.ask_arr[day - 1])
+
+        trades = []
+        if buys:
+            trades.append(TradeResult("buy", bid, 1))
+        elif sells:
+            trades.append(TradeResult("sell", ask, 1))
+        if random_buys:
+            trades.append(TradeResult("buy", bid, 1))
+        elif random_sells:
+            trades.append(TradeResult("sell", ask, 1))
+        return trades
+
+    def calculate_daily_pnl(self, trades: List[TradeResult], market_price: float) -> float:
         """Calculate the daily P&L based on trades."""
         daily_pnl = 0.0
-        market_price = self.market.get_state().price
         for trade in trades:
             if trade.trade_type == "buy":
                 daily_pnl += market_price - trade.price
@@ -103,40 +252,44 @@ class Game:
                 daily_pnl += trade.price - market_price
         
         # Log P&L calculation for debugging
-        logging.info(f"Daily P&L calculated: {daily_pnl}")
+        logging.info("Daily P&L calculated: %s", daily_pnl)
         
         return daily_pnl
 
     def log_daily_results(self, day: int, bid: float, ask: float, pnl: float, challenge: str):
         """Log the results of each trading day."""
-        self.daily_results.append((day, bid, ask, pnl, challenge))
-        logging.info(f"Day {day}: Bid={bid:.2f}, Ask={ask:.2f}, P&L={pnl:.2f}, Challenge={challenge}")
+        self.bid_arr[day - 1] = bid
+        self.ask_arr[day - 1] = ask
+        self.pnl_arr[day - 1] = pnl
+        self.challenge_arr[day - 1] = challenge
+        logging.info("Day %d: Bid=%.2f, Ask=%.2f, P&L=%.2f, Challenge=%s", day, bid, ask, pnl, challenge)
 
     def calculate_score(self) -> float:
         """Calculate the final score based on total P&L and other factors."""
         score = self.total_pnl
 
         # Penalty for negative P&L days
-        negative_pnl_days = sum(1 for _, _, _, pnl, _ in self.daily_results if pnl < 0)
+        negative_pnl_days = int((self.pnl_arr < 0).sum())
         score -= negative_pnl_days * 10
 
         # Bonus for consistent positive P&L
         consecutive_positive_days = self.get_max_consecutive_positive_days()
         score += consecutive_positive_days * 5
 
-        logging.info(f"Score calculation: Total PnL: {self.total_pnl:.2f}, "
-                     f"Negative PnL days: {negative_pnl_days}, "
-                     f"Max consecutive positive days: {consecutive_positive_days}")
+        logging.info("Score calculation: Total PnL: %.2f, "
+                     "Negative PnL days: %d, "
+                     "Max consecutive positive days: %d",
+                     self.total_pnl, negative_pnl_days, consecutive_positive_days)
 
         return max(0, score)  # Ensure the score is non-negative
 
     def get_max_consecutive_positive_days(self) -> int:
         """Calculate the maximum streak of consecutive days with positive P&L."""
-        max_streak = current_streak = 0
-        for _, _, _, pnl, _ in self.daily_results:
-            if pnl > 0:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 0
-        return max_streak
\ No newline at end of file
+        positive = self.pnl_arr > 0
+        if not positive.any():
+            return 0
+        # Streaks start where the padded mask steps 0 -> 1 and end where it steps 1 -> 0
+        edges = np.diff(np.concatenate(([0], positive.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return int((ends - starts).max())
\ No newline at end of file
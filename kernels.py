@@ -0,0 +1,39 @@
+"""
+This module defines the numeric kernels behind the analysis helpers in utils.
+
+The functions are plain Python so they can be compiled either ahead of time by
+build_kernels.py or just in time by numba when utils is imported.
+"""
+
+import math
+
+import numpy as np
+
+def rolling_volatility(returns, window):
+    """Annualized rolling volatility of returns over a trailing window."""
+    # Running sum and sum of squares over the trailing window: O(N) instead of O(N*window)
+    out = np.empty(len(returns))
+    total = 0.0
+    total_sq = 0.0
+    for i in range(len(returns)):
+        total += returns[i]
+        total_sq += returns[i] * returns[i]
+        if i >= window:
+            total -= returns[i-window]
+            total_sq -= returns[i-window] * returns[i-window]
+        count = min(i + 1, window)
+        mean = total / count
+        out[i] = math.sqrt(max(0.0, total_sq / count - mean * mean)) * math.sqrt(252)
+    return out
+
+def max_drawdown(pnl):
+    """Maximum drawdown of a cumulative PnL curve, as a fraction of the running peak."""
+    peak = pnl[0]
+    max_dd = 0.0
+    for value in pnl:
+        if value > peak:
+            peak = value
+        dd = (peak - value) / peak
+        if dd > max_dd:
+            max_dd = dd
+    return max_dd
\ No newline at end of file
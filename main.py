@@ -5,8 +5,14 @@ This script sets up the game environment, initializes components, and runs the s
 
 import argparse
 import logging
+from logging.handlers import MemoryHandler
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 import time
+from typing import Optional, Tuple
+
+import numpy as np
 
 from market import Market
 from challenges import ChallengeManager
@@ -23,6 +29,11 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
+    # Buffer records in memory and write them to the log file in batches
+    root = logging.getLogger()
+    file_handler = root.handlers[0]
+    root.handlers = [MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)]
+
 def parse_arguments():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Volatility Market Making Game")
@@ -32,8 +43,70 @@ def parse_arguments():
         default="SimpleMarketMaker",
         help="Name of the MarketMaker class to use"
     )
+    parser.add_argument(
+        "--n-trajectories",
+        type=int,
+        default=1,
+        help="Number of independent trajectories to simulate"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for multi-trajectory runs (defaults to the CPU count)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Quote the whole simulation in one vectorized market maker call"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed, for reproducible runs"
+    )
     return parser.parse_args()
 
+def _init_worker():
+    """Silence per-day logging in worker processes, whose records would interleave in the shared log file."""
+    logging.disable(logging.INFO)
+
+def _one_trajectory(seed: np.random.SeedSequence, market_maker_class: type, batch: bool) -> Tuple[float, np.ndarray]:
+    """Simulate a single independent trajectory and return its score and daily P&L."""
+    rng = np.random.default_rng(seed)
+    market = Market(INITIAL_PRICE, INITIAL_VOLATILITY, rng)
+    market.precompute(SIMULATION_DAYS)
+    game = Game(market, ChallengeManager(rng), market_maker_class(), SIMULATION_DAYS, rng, batch)
+    return game.run(), game.pnl_arr.copy()
+
+def run_many(n_trajectories: int, market_maker_class: type, workers: Optional[int] = None,
+             seed: Optional[int] = None, batch: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate independent trajectories in parallel worker processes.
+
+    Args:
+        n_trajectories (int): The number of trajectories to simulate.
+        market_maker_class (type): The MarketMaker class to use.
+        workers (Optional[int]): The number of worker processes.
+        seed (Optional[int]): Root seed; each trajectory gets its own spawned SeedSequence.
+        batch (bool): Whether each game quotes in batch mode.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The final scores, shape (n_trajectories,), and
+            daily P&L, shape (n_trajectories, SIMULATION_DAYS).
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_trajectories)
+
+    # Flush buffered records so forked workers don't inherit and re-emit them
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        results = list(executor.map(_one_trajectory, seeds, repeat(market_maker_class), repeat(batch)))
+    scores = np.array([score for score, _ in results])
+    pnls = np.stack([pnl for _, pnl in results])
+    return scores, pnls
+
 def main():
     """Main function to run the Volatility Market Making Game."""
     # Set up logging and parse arguments
@@ -41,15 +114,31 @@ def main():
     args = parse_arguments()
 
     logging.info("Starting Volatility Market Making Game")
+
+    if args.n_trajectories > 1:
+        start_time = datetime.now()
+        scores, _ = run_many(args.n_trajectories, get_market_maker_class(args.market_maker), args.workers,
+                             seed=args.seed, batch=args.batch)
+        duration = (datetime.now() - start_time).total_seconds()
+
+        logging.info(f"{args.n_trajectories} trajectories completed in {duration:.2f} seconds")
+        logging.info(f"Mean Score: {np.mean(scores):.2f}, Score Std: {np.std(scores):.2f}")
+
+        print(f"\n{args.n_trajectories} trajectories completed in {duration:.2f} seconds")
+        print(f"Mean Score: {np.mean(scores):.2f}")
+        print(f"Score Std: {np.std(scores):.2f}")
+        return
     
     # Initialize game components
-    market = Market(INITIAL_PRICE, INITIAL_VOLATILITY)
-    challenge_manager = ChallengeManager()
+    rng = np.random.default_rng(args.seed)
+    market = Market(INITIAL_PRICE, INITIAL_VOLATILITY, rng)
+    market.precompute(SIMULATION_DAYS)
+    challenge_manager = ChallengeManager(rng)
     
     MarketMakerClass = get_market_maker_class(args.market_maker)
     market_maker = MarketMakerClass()
     
-    game = Game(market, challenge_manager, market_maker, SIMULATION_DAYS)
+    game = Game(market, challenge_manager, market_maker, SIMULATION_DAYS, rng, args.batch)
 
     # Run the game
     start_time = datetime.now()
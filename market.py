@@ -3,11 +3,16 @@ This module defines the Market class, which simulates a financial market
 with price movements and volatility changes.
 """
 
-import random
-import math
 from dataclasses import dataclass
+from typing import Optional
 
-@dataclass
+import numpy as np
+
+# Floors that keep the price and volatility from going too low
+MIN_PRICE = 0.01
+MIN_VOLATILITY = 0.001
+
+@dataclass(slots=True)
 class MarketState:
     """Represents the current state of the market."""
     price: float
@@ -16,60 +21,118 @@ class MarketState:
 class Market:
     """Simulates a financial market with price movements and volatility changes."""
 
-    def __init__(self, initial_price: float, initial_volatility: float):
+    def __init__(self, initial_price: float, initial_volatility: float,
+                 rng: Optional[np.random.Generator] = None):
         """
         Initialize the market with a starting price and volatility.
 
         Args:
             initial_price (float): The starting price of the asset.
             initial_volatility (float): The starting volatility of the asset.
+            rng (Optional[np.random.Generator]): Generator for the daily returns.
+                Defaults to a freshly seeded np.random.default_rng().
         """
         self.state = MarketState(initial_price, initial_volatility)
+        self._rng = np.random.default_rng() if rng is None else rng
         self.day = 0
+        self._returns = np.empty(0)
+        self._factors = np.empty(0)
+        self._prices = np.empty(0)
+
+    def precompute(self, days: int):
+        """
+        Draw the daily returns for the whole simulation in a single vectorized pass.
+
+        Args:
+            days (int): The number of trading days to precompute.
+        """
+        self._returns = self.state.volatility * self._rng.standard_normal(days)
+        self._factors = self.price_factors(self._returns)
+        self._prices = np.empty(days)
+
+    @staticmethod
+    def price_factors(returns: np.ndarray) -> np.ndarray:
+        """Convert daily returns into price factors, limited to prevent extreme movements."""
+        with np.errstate(over='ignore'):
+            return np.clip(np.exp(returns), 0.5, 2.0)
 
     def update(self):
         """
         Update the market state for a new day.
         
-        This method simulates daily price movement based on the current volatility.
-        It uses a log-normal distribution to model price changes and includes
-        safeguards against extreme price movements.
+        This method applies the precomputed daily price factor for the current day.
+        Price changes follow a log-normal distribution, with safeguards against
+        extreme price movements.
         """
-        self.day += 1
-        
-        # Calculate daily return using a normal distribution
-        daily_return = random.gauss(0, self.state.volatility)
-        
-        # Update price using the log-normal distribution, with bounds
-        try:
-            price_factor = math.exp(daily_return)
-            # Limit the price change to prevent extreme movements
-            price_factor = max(0.5, min(2.0, price_factor))
-            self.state.price *= price_factor
-        except OverflowError:
-            # If we get an overflow, limit the price change
-            if daily_return > 0:
-                self.state.price *= 2.0
-            else:
-                self.state.price *= 0.5
+        if self.day >= len(self._factors):
+            raise RuntimeError("Market.precompute() must be called for every simulated day")
 
         # Ensure the price doesn't go too close to zero
-        self.state.price = max(0.01, self.state.price)
+        self.state.price = max(MIN_PRICE, self.state.price * float(self._factors[self.day]))
+        self._prices[self.day] = self.state.price
+        self.day += 1
 
-    def apply_challenge(self, price_factor: float, volatility_factor: float):
+    def apply_challenge(self, new_price: float, new_volatility: float):
         """
-        Apply a market challenge by adjusting price and volatility.
+        Apply a market challenge by setting the new price and volatility.
 
         Args:
-            price_factor (float): Factor to multiply the current price by.
-            volatility_factor (float): Factor to multiply the current volatility by.
+            new_price (float): The price after the challenge.
+            new_volatility (float): The volatility after the challenge.
         """
-        self.state.price *= price_factor
-        self.state.volatility *= volatility_factor
-        
+        old_volatility = self.state.volatility
+
         # Ensure the price and volatility don't go too low
-        self.state.price = max(0.01, self.state.price)
-        self.state.volatility = max(0.001, self.state.volatility)
+        self.state.price = max(MIN_PRICE, new_price)
+        self.state.volatility = max(MIN_VOLATILITY, new_volatility)
+
+        # The challenge sets the day's closing price
+        if self.day:
+            self._prices[self.day - 1] = self.state.price
+
+        self._rescale_returns(old_volatility)
+
+    def _rescale_returns(self, old_volatility: float):
+        """Rescale the remaining daily returns from the old volatility to the current one."""
+        if self.state.volatility != old_volatility:
+            self._returns[self.day:] *= self.state.volatility / old_volatility
+            self._factors[self.day:] = self.price_factors(self._returns[self.day:])
+
+    def upcoming_returns(self, days: int) -> np.ndarray:
+        """
+        Get the precomputed daily returns for the next days, at the current volatility.
+
+        Args:
+            days (int): The number of upcoming days.
+
+        Returns:
+            np.ndarray: The daily returns, shape (days,).
+        """
+        if self.day + days > len(self._returns):
+            raise RuntimeError("Market.precompute() must be called for every simulated day")
+        return self._returns[self.day:self.day + days]
+
+    def record_path(self, prices: np.ndarray, volatilities: np.ndarray):
+        """
+        Move the market to the end of a path simulated outside update().
+
+        Args:
+            prices (np.ndarray): The end-of-day price for each simulated day.
+            volatilities (np.ndarray): The end-of-day volatility for each simulated day.
+        """
+        if len(prices) == 0:
+            return
+        old_volatility = self.state.volatility
+        self._prices[self.day:self.day + len(prices)] = prices
+        self.day += len(prices)
+        self.state.price = float(prices[-1])
+        self.state.volatility = float(volatilities[-1])
+        self._rescale_returns(old_volatility)
+
+    @property
+    def price_history(self) -> np.ndarray:
+        """The end-of-day price for each day simulated so far."""
+        return self._prices[:self.day]
 
     def get_state(self) -> MarketState:
         """
@@ -4,9 +4,13 @@ This module defines the MarketMaker base class and various market making strateg
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 class MarketMaker(ABC):
     """Abstract base class for market makers."""
 
+    __slots__ = ()
+
     @abstractmethod
     def make_market(self, price: float, volatility: float) -> tuple[float, float]:
         """
@@ -21,9 +25,29 @@ class MarketMaker(ABC):
         """
         pass
 
+    def make_market_batch(self, prices: np.ndarray, volatilities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generate bid and ask prices for a whole schedule of market states.
+
+        Strategies can override this with a vectorized implementation; the default
+        calls make_market once per day.
+
+        Args:
+            prices (np.ndarray): The market price for each day.
+            volatilities (np.ndarray): The market volatility for each day.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Arrays of the (bid, ask) prices for each day.
+        """
+        quotes = [self.make_market(float(p), float(v)) for p, v in zip(prices, volatilities)]
+        bids, asks = np.array(quotes, dtype=np.float64).reshape(-1, 2).T
+        return bids, asks
+
 class SimpleMarketMaker(MarketMaker):
     """A simple market maker that sets a fixed spread based on volatility."""
 
+    __slots__ = ('spread_multiplier',)
+
     def __init__(self, spread_multiplier: float = 0.1):
         self.spread_multiplier = spread_multiplier
 
@@ -33,6 +57,12 @@ class SimpleMarketMaker(MarketMaker):
         ask = price + spread
         return bid, ask
 
+    def make_market_batch(self, prices: np.ndarray, volatilities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        spread = prices * volatilities * self.spread_multiplier
+        bids = np.maximum(0.01, prices - spread)
+        asks = prices + spread
+        return bids, asks
+
 def get_market_maker_class(class_name: str):
     """Dynamically import and return the specified MarketMaker class."""
     try:
@@ -1,11 +1,21 @@
 # utils.py
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-def calculate_returns(prices: List[float]) -> List[float]:
+try:
+    # Ahead-of-time compiled by build_kernels.py
+    from vg_kernels import rolling_volatility_f64 as _rolling_volatility_nb
+    from vg_kernels import max_drawdown_f64 as _max_drawdown_nb
+except ImportError:
+    from numba import njit
+
+    import kernels
+
+    _rolling_volatility_nb = njit(cache=True)(kernels.rolling_volatility)
+    _max_drawdown_nb = njit(cache=True)(kernels.max_drawdown)
+
+def calculate_returns(prices: List[float]) -> np.ndarray:
     """
     Calculate the logarithmic returns of a price series.
     
@@ -13,11 +23,12 @@ def calculate_returns(prices: List[float]) -> List[float]:
         prices (List[float]): List of prices.
     
     Returns:
-        List[float]: List of logarithmic returns.
+        np.ndarray: Array of logarithmic returns.
     """
-    return [np.log(prices[i] / prices[i-1]) for i in range(1, len(prices))]
+    p = np.asarray(prices, dtype=np.float64)
+    return np.log(p[1:] / p[:-1])
 
-def calculate_volatility(returns: List[float], window: int = 30) -> List[float]:
+def calculate_volatility(returns: List[float], window: int = 30) -> np.ndarray:
     """
     Calculate rolling volatility of returns.
     
@@ -26,9 +37,9 @@ def calculate_volatility(returns: List[float], window: int = 30) -> List[float]:
         window (int): Rolling window size.
     
     Returns:
-        List[float]: List of volatilities.
+        np.ndarray: Array of volatilities.
     """
-    return [np.std(returns[max(0, i-window):i]) * np.sqrt(252) for i in range(1, len(returns)+1)]
+    return _rolling_volatility_nb(np.asarray(returns, dtype=np.float64), window)
 
 def sharpe_ratio(returns: List[float], risk_free_rate: float = 0.02) -> float:
     """
@@ -54,15 +65,7 @@ def max_drawdown(pnl: List[float]) -> float:
     Returns:
         float: Maximum drawdown as a percentage.
     """
-    peak = pnl[0]
-    max_dd = 0
-    for value in pnl:
-        if value > peak:
-            peak = value
-        dd = (peak - value) / peak
-        if dd > max_dd:
-            max_dd = dd
-    return max_dd
+    return _max_drawdown_nb(np.asarray(pnl, dtype=np.float64))
 
 def plot_pnl_curve(days: List[int], pnl: List[float], title: str = "Cumulative PnL"):
     """
@@ -73,6 +76,8 @@ def plot_pnl_curve(days: List[int], pnl: List[float], title: str = "Cumulative P
         pnl (List[float]): List of cumulative PnL values.
         title (str): Title of the plot.
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(12, 6))
     plt.plot(days, pnl)
     plt.title(title)
@@ -108,24 +113,32 @@ def calculate_market_impact(trade_price: float, market_price: float) -> float:
     """
     return (trade_price - market_price) / market_price
 
-def analyze_market_making_performance(daily_results: List[Tuple[int, float, float, float, str]]):
+def analyze_market_making_performance(game):
     """
     Analyze and print various performance metrics for a market making strategy.
     
     Args:
-        daily_results (List[Tuple[int, float, float, float, str]]): 
-            List of daily results (day, bid, ask, pnl, challenge).
+        game (Game): A completed game whose daily results (days_arr, bid_arr,
+            ask_arr, pnl_arr, challenge_arr) are analyzed.
     """
-    df = pd.DataFrame(daily_results, columns=['Day', 'Bid', 'Ask', 'PnL', 'Challenge'])
+    import pandas as pd
+
+    df = pd.DataFrame({
+        'Day': game.days_arr,
+        'Bid': game.bid_arr,
+        'Ask': game.ask_arr,
+        'PnL': game.pnl_arr,
+        'Challenge': game.challenge_arr,
+    })
     
     total_pnl = df['PnL'].sum()
     avg_daily_pnl = df['PnL'].mean()
     pnl_std = df['PnL'].std()
     
     sharpe = sharpe_ratio(df['PnL'].tolist())
-    max_dd = max_drawdown(df['PnL'].cumsum().tolist())
+    max_dd = _max_drawdown_nb(df['PnL'].cumsum().to_numpy(dtype=np.float64))
     
-    avg_spread = df.apply(lambda row: calculate_bid_ask_spread(row['Bid'], row['Ask']), axis=1).mean()
+    avg_spread = ((df['Ask'] - df['Bid']) / ((df['Ask'] + df['Bid']) / 2.0)).mean()
     
     print(f"Total PnL: ${total_pnl:.2f}")
     print(f"Average Daily PnL: ${avg_daily_pnl:.2f}")
@@ -139,7 +152,8 @@ def analyze_market_making_performance(daily_results: List[Tuple[int, float, floa
     
     plot_pnl_curve(df['Day'].tolist(), df['PnL'].cumsum().tolist())
 
-def simulate_order_book(mid_price: float, depth: int = 5, max_spread: float = 0.01):
+def simulate_order_book(mid_price: float, depth: int = 5, max_spread: float = 0.01,
+                        rng: Optional[np.random.Generator] = None):
     """
     Simulate a simple order book.
     
@@ -147,12 +161,19 @@ def simulate_order_book(mid_price: float, depth: int = 5, max_spread: float = 0.
         mid_price (float): The mid price of the asset.
         depth (int): The number of levels to generate on each side.
         max_spread (float): The maximum spread as a percentage of mid price.
+        rng (Optional[np.random.Generator]): Generator for the quantities.
     
     Returns:
         Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]: Bids and asks as (price, quantity) tuples.
     """
-    bids = [(mid_price * (1 - max_spread * (i+1)/depth), np.random.randint(1, 100)) for i in range(depth)]
-    asks = [(mid_price * (1 + max_spread * (i+1)/depth), np.random.randint(1, 100)) for i in range(depth)]
+    levels = np.arange(1, depth + 1) / depth
+    bid_prices = mid_price * (1 - max_spread * levels)
+    ask_prices = mid_price * (1 + max_spread * levels)
+    if rng is None:
+        rng = np.random.default_rng()
+    quantities = rng.integers(1, 100, size=2 * depth)
+    bids = list(zip(bid_prices.tolist(), quantities[:depth].tolist()))
+    asks = list(zip(ask_prices.tolist(), quantities[depth:].tolist()))
     return bids, asks
 
 def plot_order_book(bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]):
@@ -166,6 +187,8 @@ def plot_order_book(bids: List[Tuple[float, float]], asks: List[Tuple[float, flo
     bid_prices, bid_quantities = zip(*bids)
     ask_prices, ask_quantities = zip(*asks)
     
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(12, 6))
     plt.bar(bid_prices, bid_quantities, color='g', alpha=0.5, label='Bids')
     plt.bar(ask_prices, ask_quantities, color='r', alpha=0.5, label='Asks')